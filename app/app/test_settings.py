@@ -0,0 +1,21 @@
+"""
+Django settings used when running the test suite.
+"""
+import os
+
+from app.settings import *  # noqa: F401,F403
+
+# Hash strength is irrelevant in tests, PBKDF2 would dominate user setup.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# TEST_DB=sqlite runs the suite on an in-memory database, for quick local
+# runs without PostgreSQL. CI keeps testing against PostgreSQL.
+if os.environ.get('TEST_DB') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
@@ -72,6 +72,10 @@ class Recipe(models.Model):
     tags = models.ManyToManyField('Tag')
     ingredients = models.ManyToManyField('Ingredient')
     image = models.ImageField(null=True, upload_to=recipe_image_file_path)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', '-id'])]
 
     def __str__(self):
         return self.title
@@ -85,6 +89,9 @@ class Tag(models.Model):
     )
     name = models.CharField(max_length=255)
 
+    class Meta:
+        indexes = [models.Index(fields=['user', 'name'])]
+
     def __str__(self):
         return self.name
 
@@ -97,5 +104,8 @@ class Ingredient(models.Model):
     )
     name = models.CharField(max_length=255)
 
+    class Meta:
+        indexes = [models.Index(fields=['user', 'name'])]
+
     def __str__(self):
         return self.name
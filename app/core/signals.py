@@ -0,0 +1,65 @@
+"""
+Signal handlers for the core models.
+"""
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import Ingredient, Recipe, Tag
+
+# Only writes that send signals are seen here. QuerySet.update() on tags
+# or ingredients and bulk writes on the through tables (bulk_create, or
+# delete() on a through queryset) bypass them, so callers using those
+# must touch the affected recipes themselves.
+
+RECIPE_FIELDS = {Tag: 'tags', Ingredient: 'ingredients'}
+THROUGH_FIELDS = {
+    Recipe.tags.through: 'tags',
+    Recipe.ingredients.through: 'ingredients',
+}
+
+
+def touch_recipes(recipes):
+    """Bump updated_at so cached recipe representations are refreshed."""
+    recipes.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def attr_saved(sender, instance, created, **kwargs):
+    """Expire the recipes showing a changed tag or ingredient."""
+    if not created:
+        field = RECIPE_FIELDS[sender]
+        touch_recipes(Recipe.objects.filter(**{field: instance}))
+
+
+# The recipe links are deleted along with the attribute, so they have to
+# be followed before the delete rather than after it.
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_delete, sender=Ingredient)
+def attr_deleted(sender, instance, **kwargs):
+    """Expire the recipes showing a deleted tag or ingredient."""
+    field = RECIPE_FIELDS[sender]
+    touch_recipes(Recipe.objects.filter(**{field: instance}))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def recipe_attrs_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    """Expire the recipes whose tags or ingredients were changed."""
+    if action in ('post_add', 'post_remove') and not pk_set:
+        return
+
+    if reverse:
+        # instance is the tag or ingredient, pk_set holds recipe ids.
+        if action in ('post_add', 'post_remove'):
+            touch_recipes(Recipe.objects.filter(pk__in=pk_set))
+        elif action == 'pre_clear':
+            field = THROUGH_FIELDS[sender]
+            touch_recipes(Recipe.objects.filter(**{field: instance}))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        instance.updated_at = timezone.now()
+        Recipe.objects.filter(pk=instance.pk).update(
+            updated_at=instance.updated_at
+        )
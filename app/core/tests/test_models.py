@@ -10,20 +10,26 @@ from core import models
 
 from unittest.mock import patch
 
+User = get_user_model()
+
 
 def create_sample_user(email="test@example.com", password="testpass123"):
     """Create and returns a sample user."""
-    return get_user_model().objects.create_user(email=email, password=password)
+    return User.objects.create_user(email=email, password=password)
 
 
 class ModelTests(TestCase):
     """Test models."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_sample_user(email="sample@example.com")
+
     def test_create_user_with_email_successfully(self):
         """Test creating a user with an email is successful."""
         email = "test@example.com"
         password = "testpass123"
-        user = get_user_model().objects.create_user(
+        user = User.objects.create_user(
             email=email,
             password=password,
         )
@@ -41,18 +47,19 @@ class ModelTests(TestCase):
             ["test4@example.COM", "test4@example.com"]
         ]
 
+        # No password, so create_user skips hashing entirely.
         for email, expected in sample_emails:
-            user = get_user_model().objects.create_user(email, "sample123")
+            user = User.objects.create_user(email)
             self.assertEqual(user.email, expected)
 
     def test_new_user_without_email_raises_error(self):
         """Test that creating a user without an email raises a ValueError."""
         with self.assertRaises(ValueError):
-            get_user_model().objects.create_user('', 'test123')
+            User.objects.create_user('', 'test123')
 
     def test_create_superuser(self):
         """Test creating a superuser."""
-        user = get_user_model().objects.create_superuser(
+        user = User.objects.create_superuser(
             email="test@example.com",
             password="test123"
         )
@@ -62,7 +69,7 @@ class ModelTests(TestCase):
 
     def test_create_recipe(self):
         """Test creating a recipe is successful."""
-        user = get_user_model().objects.create_user(
+        user = User.objects.create_user(
             email="test@example.com",
             password="testpass123",
             name="Test Name",
@@ -79,20 +86,44 @@ class ModelTests(TestCase):
 
     def test_create_tag(self):
         """Test creating a tag is successful."""
-        user = create_sample_user()
-        tag = models.Tag.objects.create(user=user, name="Test Tag")
+        tag = models.Tag.objects.create(user=self.user, name="Test Tag")
 
         self.assertEqual(str(tag), tag.name)
 
     def test_create_ingredient(self):
         """Test creating an ingredient is successful."""
-        user = create_sample_user()
         ingredient = models.Ingredient.objects.create(
-            user=user, name="Test Ingredient"
+            user=self.user, name="Test Ingredient"
         )
 
         self.assertEqual(str(ingredient), ingredient.name)
 
+    def test_recipe_attr_changes_bump_updated_at(self):
+        """Test tag and ingredient changes made via the ORM mark recipes."""
+        recipe = models.Recipe.objects.create(
+            user=self.user,
+            title="Test Recipe",
+            time_minutes=5,
+            price=Decimal("5.99"),
+        )
+        tag = models.Tag.objects.create(user=self.user, name="Tag")
+        ingredient = models.Ingredient.objects.create(
+            user=self.user, name="Salt"
+        )
+        changes = [
+            lambda: recipe.tags.add(tag),
+            lambda: ingredient.recipe_set.add(recipe),
+            lambda: tag.save(),
+            lambda: ingredient.delete(),
+            lambda: recipe.tags.clear(),
+        ]
+
+        for change in changes:
+            before = models.Recipe.objects.get(pk=recipe.pk).updated_at
+            change()
+            after = models.Recipe.objects.get(pk=recipe.pk).updated_at
+            self.assertGreater(after, before)
+
     @patch('core.models.uuid.uuid4')
     def test_recipe_file_name_uuid(self, mock_uuid):
         """Test that the image is saved with a unique name."""
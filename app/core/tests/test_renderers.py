@@ -0,0 +1,47 @@
+"""
+Tests for the API renderers.
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import OrjsonRenderer
+
+
+class OrjsonRendererTests(SimpleTestCase):
+    """Test the orjson renderer."""
+
+    def test_output_matches_drf_renderer(self):
+        """Test rendered bytes are the same as DRF's JSON renderer."""
+        data = [{
+            'id': 1,
+            'name': 'Crème brûlée',
+            'description': 'line\u2028paragraph\u2029end',
+            'price': Decimal('5.50'),
+            'created': datetime(2022, 1, 1, 12, 30, tzinfo=timezone.utc),
+            'error': gettext_lazy('Not found.'),
+            'tags': [],
+            'image': None,
+        }]
+
+        rendered = OrjsonRenderer().render(data)
+
+        self.assertIsInstance(rendered, bytes)
+        self.assertEqual(rendered, JSONRenderer().render(data))
+
+    def test_render_none(self):
+        """Test rendering no data returns an empty body."""
+        self.assertEqual(OrjsonRenderer().render(None), b'')
+
+    def test_indent_falls_back_to_drf(self):
+        """Test an indented response is rendered by DRF's renderer."""
+        data = {'id': 1}
+        media_type = 'application/json; indent=4'
+
+        rendered = OrjsonRenderer().render(data, media_type)
+
+        self.assertEqual(rendered, JSONRenderer().render(data, media_type))
@@ -1,13 +1,63 @@
 """
 Serializers for the recipe API.
 """
+from copy import copy, deepcopy
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
 
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
 
 from core.models import Recipe, Tag, Ingredient
 
 
-class TagSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """Build the serializer fields once per class and copy them per use."""
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+
+        # Nested serializers hold a bound child, so they need a deep copy.
+        return {
+            name: (
+                deepcopy(field)
+                if isinstance(field, serializers.BaseSerializer)
+                else copy(field)
+            )
+            for name, field in self._fields_cache[cls].items()
+        }
+
+
+class DictRepresentationMixin:
+    """Represent instances as plain dicts instead of OrderedDicts."""
+
+    def to_representation(self, instance):
+        ret = {}
+        for field in self._readable_fields:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+
+            check_for_none = attribute.pk if isinstance(
+                attribute, PKOnlyObject) else attribute
+            if check_for_none is None:
+                ret[field.field_name] = None
+            else:
+                ret[field.field_name] = field.to_representation(attribute)
+
+        return ret
+
+
+class TagSerializer(CachedFieldsMixin,
+                    DictRepresentationMixin,
+                    serializers.ModelSerializer):
     """Serializer for tag objects."""
 
     class Meta:
@@ -16,7 +66,9 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(CachedFieldsMixin,
+                           DictRepresentationMixin,
+                           serializers.ModelSerializer):
     """Serializer for ingredient objects."""
 
     class Meta:
@@ -25,7 +77,38 @@ class IngredientSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeListSerializer(serializers.ListSerializer):
+    """Serialize recipes, batching the cached representations per list."""
+
+    def to_representation(self, data):
+        timeout = settings.RECIPE_CACHE_TIMEOUT
+        if not timeout:
+            return super().to_representation(data)
+
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        recipes = list(iterable)
+        # updated_at moves on every change, so keys never need deleting.
+        keys = [
+            f'{type(self.child).__name__}:{recipe.pk}:'
+            f'{recipe.updated_at.timestamp()}'
+            for recipe in recipes
+        ]
+        cached = cache.get_many(keys)
+
+        missing = {}
+        for key, recipe in zip(keys, recipes):
+            if key not in cached:
+                missing[key] = self.child.to_representation(recipe)
+        if missing:
+            cache.set_many(missing, timeout)
+
+        cached.update(missing)
+        return [cached[key] for key in keys]
+
+
+class RecipeSerializer(CachedFieldsMixin,
+                       DictRepresentationMixin,
+                       serializers.ModelSerializer):
     """Serializer for recipe objects."""
     tags = TagSerializer(many=True, required=False)
     ingredients = IngredientSerializer(many=True, required=False)
@@ -42,48 +125,71 @@ class RecipeSerializer(serializers.ModelSerializer):
             'ingredients'
         ]
         read_only_fields = ['id']
+        list_serializer_class = RecipeListSerializer
 
     def create(self, validated_data):
         """Create a new recipe with associated tags and ingredients."""
         tags_data = validated_data.pop('tags', [])
         ingredients_data = validated_data.pop('ingredients', [])
-        recipe = Recipe.objects.create(**validated_data)
-        self._get_or_create_tags(tags_data, recipe)
-        self._get_or_create_ingredients(ingredients_data, recipe)
+        auth_user = self.context['request'].user
+        # Readers must never see, and cache, the recipe without its tags.
+        with transaction.atomic():
+            recipe = Recipe.objects.create(**validated_data)
+            self._get_or_create_tags(tags_data, recipe, auth_user)
+            self._get_or_create_ingredients(
+                ingredients_data, recipe, auth_user)
         return recipe
 
     def update(self, instance, validated_data):
         """Update a recipe and its associated tags."""
         tags_data = validated_data.pop('tags', None)
         ingredients_data = validated_data.pop('ingredients', None)
+        auth_user = self.context['request'].user
 
         if tags_data is not None:
-            instance.tags.clear()
-            self._get_or_create_tags(tags_data, instance)
+            self._get_or_create_tags(tags_data, instance, auth_user)
 
         if ingredients_data is not None:
-            instance.ingredients.clear()
-            self._get_or_create_ingredients(ingredients_data, instance)
+            self._get_or_create_ingredients(
+                ingredients_data, instance, auth_user)
 
         for k, v in validated_data.items():
             setattr(instance, k, v)
 
-        instance.save()
+        # updated_at versions the cached representation, tag and
+        # ingredient changes bump it through core.signals.
+        if validated_data:
+            instance.save(update_fields=[*validated_data, 'updated_at'])
 
         return instance
 
-    def _get_or_create_tags(self, tags_data, instance):
-        auth_user = self.context['request'].user
-        for tag_data in tags_data:
-            tag, _ = Tag.objects.get_or_create(user=auth_user, **tag_data)
-            instance.tags.add(tag)
-
-    def _get_or_create_ingredients(self, ingredients_data, instance):
-        auth_user = self.context['request'].user
-        for ingredient_data in ingredients_data:
-            ingredient, _ = Ingredient.objects.get_or_create(
-                user=auth_user, **ingredient_data)
-            instance.ingredients.add(ingredient)
+    def _get_or_create_tags(self, tags_data, instance, auth_user):
+        """Sync the recipe tags, only writing the rows that changed."""
+        tags = self._get_or_create_attrs(Tag, tags_data, auth_user)
+        instance.tags.set(tags)
+
+    def _get_or_create_ingredients(self, ingredients_data, instance,
+                                   auth_user):
+        """Sync the recipe ingredients, only writing the rows that changed."""
+        ingredients = self._get_or_create_attrs(
+            Ingredient, ingredients_data, auth_user)
+        instance.ingredients.set(ingredients)
+
+    def _get_or_create_attrs(self, model, attrs_data, auth_user):
+        """Fetch the user's attributes by name, bulk creating missing ones."""
+        # dict.fromkeys dedupes while keeping the payload order, so new
+        # rows get their ids in the order the client sent them.
+        names = list(dict.fromkeys(
+            attr_data['name'] for attr_data in attrs_data))
+        existing = {
+            attr.name: attr for attr in model.objects.filter(
+                user=auth_user, name__in=names)
+        }
+        missing = [
+            model(user=auth_user, name=name)
+            for name in names if name not in existing
+        ]
+        return list(existing.values()) + model.objects.bulk_create(missing)
 
 
 class RecipeDetailSerializer(RecipeSerializer):
@@ -92,6 +198,8 @@ class RecipeDetailSerializer(RecipeSerializer):
     class Meta(RecipeSerializer.Meta):
         fields = RecipeSerializer.Meta.fields + ['description', 'image']
         read_only_fields = RecipeSerializer.Meta.read_only_fields
+        # Image URLs are built from the request host, so can't be shared.
+        list_serializer_class = serializers.ListSerializer
 
 
 class RecipeImageSerializer(serializers.ModelSerializer):
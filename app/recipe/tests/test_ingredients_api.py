@@ -2,6 +2,7 @@
 Test cases for the ingredients API.
 """
 from decimal import Decimal
+from functools import lru_cache
 
 from django.test import TestCase
 from django.urls import reverse
@@ -10,13 +11,15 @@ from rest_framework.test import APIClient
 from rest_framework import status
 
 from core.models import Ingredient, Recipe
-from recipe.serializers import IngredientSerializer
 
 from django.contrib.auth import get_user_model
 
+User = get_user_model()
+
 INGREDIENTS_URL = reverse('recipe:ingredient-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(ingredient_id):
     """Return ingredient detail URL."""
     return reverse('recipe:ingredient-detail', args=[ingredient_id])
@@ -29,7 +32,7 @@ def create_user(**params):
         'password': 'testpass123'
     }
     payload.update(params)
-    return get_user_model().objects.create_user(**payload)
+    return User.objects.create_user(**payload)
 
 
 class PublicIngredientsApiTests(TestCase):
@@ -50,32 +53,41 @@ class PublicIngredientsApiTests(TestCase):
 class PrivateIngredientsApiTests(TestCase):
     """Test the authorized user ingredients API."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
         self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_ingredients(self):
         """Test retrieving ingredients."""
-        Ingredient.objects.create(user=self.user, name='Carrot')
-        Ingredient.objects.create(user=self.user, name='Potato')
+        Ingredient.objects.bulk_create([
+            Ingredient(user=self.user, name='Carrot'),
+            Ingredient(user=self.user, name='Potato'),
+        ])
 
         res = self.client.get(INGREDIENTS_URL)
 
-        ingredients = Ingredient.objects.all().order_by('-name')
-        serializer = IngredientSerializer(ingredients, many=True)
+        expected = list(
+            Ingredient.objects.order_by('-name').values('id', 'name')
+        )
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data, expected)
 
     def test_ingredient_limited_to_user(self):
         """Test that ingredients returned are for the authenticated user."""
         other_user = create_user(email='other@example.com')
-        Ingredient.objects.create(user=other_user, name='Onion')
-        ingredient = Ingredient.objects.create(user=self.user, name='Garlic')
+        _, ingredient = Ingredient.objects.bulk_create([
+            Ingredient(user=other_user, name='Onion'),
+            Ingredient(user=self.user, name='Garlic'),
+        ])
 
         res = self.client.get(INGREDIENTS_URL)
 
-        self.assertIn(IngredientSerializer(ingredient).data, res.data)
+        ids = {row['id'] for row in res.data}
+        self.assertEqual(ids, {ingredient.id})
 
     def test_update_ingredient(self):
         """Test updating an ingredient."""
@@ -101,8 +113,10 @@ class PrivateIngredientsApiTests(TestCase):
 
     def test_filter_ingredients_by_assigned_to_recipes(self):
         """Test filtering ingredients by those assigned to recipes."""
-        ingredient1 = Ingredient.objects.create(user=self.user, name='Tomato')
-        ingredient2 = Ingredient.objects.create(user=self.user, name='Lettuce')
+        ingredient1, ingredient2 = Ingredient.objects.bulk_create([
+            Ingredient(user=self.user, name='Tomato'),
+            Ingredient(user=self.user, name='Lettuce'),
+        ])
         recipe = Recipe.objects.create(
             title='Salad',
             time_minutes=10,
@@ -113,29 +127,35 @@ class PrivateIngredientsApiTests(TestCase):
 
         res = self.client.get(INGREDIENTS_URL, {'assigned_only': 1})
 
-        serializer1 = IngredientSerializer(ingredient1)
-        serializer2 = IngredientSerializer(ingredient2)
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        ids = {row['id'] for row in res.data}
+        self.assertIn(ingredient1.id, ids)
+        self.assertNotIn(ingredient2.id, ids)
 
     def test_filtered_ingredients_unique(self):
         """Test that filtered ingredients returns unique items."""
-        ingredient1 = Ingredient.objects.create(user=self.user, name='Egg')
-        Ingredient.objects.create(user=self.user, name='Milk')
-        recipe1 = Recipe.objects.create(
-            title='Omelette',
-            time_minutes=5,
-            price=Decimal('2.00'),
-            user=self.user
-        )
-        recipe1.ingredients.add(ingredient1)
-        recipe2 = Recipe.objects.create(
-            title='Scrambled Eggs',
-            time_minutes=5,
-            price=Decimal('2.50'),
-            user=self.user
-        )
-        recipe2.ingredients.add(ingredient1)
+        ingredient1, _ = Ingredient.objects.bulk_create([
+            Ingredient(user=self.user, name='Egg'),
+            Ingredient(user=self.user, name='Milk'),
+        ])
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                title='Omelette',
+                time_minutes=5,
+                price=Decimal('2.00'),
+                user=self.user
+            ),
+            Recipe(
+                title='Scrambled Eggs',
+                time_minutes=5,
+                price=Decimal('2.50'),
+                user=self.user
+            ),
+        ])
+        RecipeIngredient = Recipe.ingredients.through
+        RecipeIngredient.objects.bulk_create([
+            RecipeIngredient(recipe=recipe, ingredient=ingredient1)
+            for recipe in recipes
+        ])
 
         res = self.client.get(INGREDIENTS_URL, {'assigned_only': 1})
 
@@ -2,14 +2,18 @@
 Tests for the recipe API.
 """
 
+import io
 import os
-import tempfile
 
 from decimal import Decimal
+from functools import lru_cache
 from PIL import Image
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from django.urls import reverse
 
@@ -24,11 +28,13 @@ from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
 RECIPES_URL = reverse('recipe:recipe-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(recipe_id):
     """Create and return a recipe detail URL."""
     return reverse('recipe:recipe-detail', args=[recipe_id])
 
 
+@lru_cache(maxsize=None)
 def image_upload_url(recipe_id):
     """Create and return a recipe image upload URL."""
     return reverse('recipe:recipe-upload-image', args=[recipe_id])
@@ -49,6 +55,28 @@ def create_recipe(user, **params):
     return recipe
 
 
+def create_recipes(user, *titles):
+    """Create and return sample recipes with the given titles."""
+    return Recipe.objects.bulk_create([
+        Recipe(
+            user=user, title=title, time_minutes=10, price=Decimal('5.00')
+        )
+        for title in titles
+    ])
+
+
+def create_tags(user, *names):
+    """Create and return tags with the given names."""
+    return Tag.objects.bulk_create([Tag(user=user, name=n) for n in names])
+
+
+def create_ingredients(user, *names):
+    """Create and return ingredients with the given names."""
+    return Ingredient.objects.bulk_create(
+        [Ingredient(user=user, name=n) for n in names]
+    )
+
+
 def create_user(**params):
     """Create and return a sample user."""
     return get_user_model().objects.create_user(**params)
@@ -70,12 +98,15 @@ class PublicRecipeApiTests(TestCase):
 class PrivateRecipeApiTests(TestCase):
     """Test the private recipe API."""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
             email='test@example.com',
             password='testpass'
         )
+
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_recipes(self):
@@ -83,13 +114,91 @@ class PrivateRecipeApiTests(TestCase):
         create_recipe(user=self.user)
         create_recipe(user=self.user)
 
-        res = self.client.get(RECIPES_URL)
+        # ETag version, recipes, then the tags and ingredients prefetches.
+        with self.assertNumQueries(4):
+            res = self.client.get(RECIPES_URL)
 
         recipes = Recipe.objects.all().order_by('-id')
         serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_retrieve_recipes_query_count_constant(self):
+        """Test listing recipes does not query per recipe."""
+        def list_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(RECIPES_URL)
+            return len(ctx.captured_queries)
+
+        tag = Tag.objects.create(user=self.user, name='Tag')
+        ingredient = Ingredient.objects.create(user=self.user, name='Salt')
+        create_recipe(user=self.user).tags.add(tag)
+        baseline = list_queries()
+
+        for _ in range(3):
+            recipe = create_recipe(user=self.user)
+            recipe.tags.add(tag)
+            recipe.ingredients.add(ingredient)
+
+        self.assertEqual(list_queries(), baseline)
+
+    def test_retrieve_recipes_not_modified(self):
+        """Test the recipe list honours If-None-Match until it changes."""
+        recipe = create_recipe(user=self.user)
+        etag = self.client.get(RECIPES_URL)['ETag']
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(detail_url(recipe.id), {'title': 'New Title'})
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]['title'], 'New Title')
+
+    def test_get_recipe_detail_not_modified(self):
+        """Test the recipe detail honours If-None-Match until it changes."""
+        recipe = create_recipe(user=self.user)
+        url = detail_url(recipe.id)
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {'title': 'New Title'})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(RECIPE_LIST_CACHE_TIMEOUT=60)
+    def test_retrieve_recipes_cached(self):
+        """Test the cached recipe list is reused until a recipe changes."""
+        recipe = create_recipe(user=self.user, title='Old Title')
+        self.client.get(RECIPES_URL)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(RECIPES_URL)
+        self.assertEqual(res.data[0]['title'], 'Old Title')
+
+        self.client.patch(detail_url(recipe.id), {'title': 'New Title'})
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(res.data[0]['title'], 'New Title')
+
+    @override_settings(RECIPE_CACHE_TIMEOUT=60, RECIPE_LIST_CACHE_TIMEOUT=60)
+    def test_retrieve_recipes_refreshed_by_orm_change(self):
+        """Test ORM tag changes invalidate the list ETag and caches."""
+        tag = create_tags(self.user, 'Tag1')[0]
+        create_recipe(user=self.user).tags.add(tag)
+        etag = self.client.get(RECIPES_URL)['ETag']
+
+        tag.name = 'Renamed'
+        tag.save()
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]['tags'][0]['name'], 'Renamed')
+
+        tag.delete()
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(res.data[0]['tags'], [])
+
     def test_retrieve_recipes_limited_to_user(self):
         """Test retrieving recipes for the authenticated user only."""
         other_user = create_user(
@@ -231,11 +340,49 @@ class PrivateRecipeApiTests(TestCase):
         res = self.client.post(RECIPES_URL, payload, format='json')
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
-        recipe = Recipe.objects.get(id=res.data['id'])
-        self.assertEqual(recipe.tags.count(), 2)
-        for tag in payload['tags']:
-            exists = recipe.tags.filter(name=tag['name']).exists()
-            self.assertTrue(exists)
+        recipe = Recipe.objects.prefetch_related('tags').get(
+            id=res.data['id']
+        )
+        tag_names = [tag.name for tag in recipe.tags.all()]
+        self.assertCountEqual(
+            tag_names, [tag['name'] for tag in payload['tags']]
+        )
+
+    def test_create_recipe_tags_follow_payload_order(self):
+        """Test new tags are created in the order they were sent."""
+        names = [f'Tag {letter}' for letter in 'kfqazmcxhb']
+        payload = {
+            'title': 'Recipe',
+            'time_minutes': 10,
+            'price': Decimal('5.00'),
+            'tags': [{'name': name} for name in names],
+        }
+
+        res = self.client.post(RECIPES_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        tags = Tag.objects.filter(user=self.user).order_by('id')
+        self.assertEqual([tag.name for tag in tags], names)
+
+    def test_create_recipe_tags_query_count_constant(self):
+        """Test creating tags and ingredients does not query per item."""
+        def create_queries(names):
+            payload = {
+                'title': 'Recipe',
+                'time_minutes': 10,
+                'price': Decimal('5.00'),
+                'tags': [{'name': name} for name in names],
+                'ingredients': [{'name': name} for name in names],
+            }
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(RECIPES_URL, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(
+            create_queries(['A']),
+            create_queries(['B', 'C', 'D', 'E'])
+        )
 
     def test_create_recipe_with_existing_tags(self):
         """Test creating a recipe with existing tags."""
@@ -252,10 +399,13 @@ class PrivateRecipeApiTests(TestCase):
         res = self.client.post(RECIPES_URL, payload, format='json')
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
-        recipe = Recipe.objects.get(id=res.data['id'])
-        self.assertEqual(recipe.tags.count(), 2)
-        self.assertIn(tag_breakfast, recipe.tags.all())
-        self.assertIn('Healthy', recipe.tags.values_list('name', flat=True))
+        recipe = Recipe.objects.prefetch_related('tags').get(
+            id=res.data['id']
+        )
+        tags = recipe.tags.all()
+        self.assertEqual(len(tags), 2)
+        self.assertIn(tag_breakfast, tags)
+        self.assertIn('Healthy', [tag.name for tag in tags])
 
     def test_create_tag_on_update(self):
         """Test creating a tag when updating a recipe."""
@@ -276,11 +426,10 @@ class PrivateRecipeApiTests(TestCase):
 
     def test_update_recipe_assigns_tags(self):
         """Test updating a recipe assigns existing tags."""
-        tag1 = Tag.objects.create(user=self.user, name='Tag1')
+        tag1, tag2 = create_tags(self.user, 'Tag1', 'Tag2')
         recipe = create_recipe(user=self.user)
         recipe.tags.add(tag1)
 
-        tag2 = Tag.objects.create(user=self.user, name='Tag2')
         payload = {'tags': [{'name': tag2.name}]}
 
         url = detail_url(recipe.id)
@@ -294,10 +443,9 @@ class PrivateRecipeApiTests(TestCase):
 
     def test_clear_recipe_tags(self):
         """Test clearing tags from a recipe."""
-        tag1 = Tag.objects.create(user=self.user, name='Tag1')
-        tag2 = Tag.objects.create(user=self.user, name='Tag2')
+        tags = create_tags(self.user, 'Tag1', 'Tag2')
         recipe = create_recipe(user=self.user)
-        recipe.tags.add(tag1, tag2)
+        recipe.tags.add(*tags)
 
         payload = {'tags': []}
         url = detail_url(recipe.id)
@@ -307,6 +455,38 @@ class PrivateRecipeApiTests(TestCase):
         recipe.refresh_from_db()
         self.assertEqual(recipe.tags.count(), 0)
 
+    def test_update_recipe_unchanged_tags_keeps_links(self):
+        """Test resubmitting the same tags does not rewrite the links."""
+        tag = Tag.objects.create(user=self.user, name='Tag1')
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(tag)
+        through = Recipe.tags.through
+        link_id = through.objects.get(recipe=recipe).id
+
+        payload = {'tags': [{'name': tag.name}]}
+        url = detail_url(recipe.id)
+        res = self.client.patch(url, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(through.objects.get(recipe=recipe).id, link_id)
+
+    @override_settings(RECIPE_CACHE_TIMEOUT=60)
+    def test_list_reflects_recipe_updates(self):
+        """Test listing recipes after an update returns fresh data."""
+        recipe = create_recipe(user=self.user, title='Old Title')
+        self.client.get(RECIPES_URL)
+
+        self.client.patch(detail_url(recipe.id), {'title': 'New Title'})
+        self.client.patch(
+            detail_url(recipe.id),
+            {'tags': [{'name': 'Tag1'}]},
+            format='json'
+        )
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data[0]['title'], 'New Title')
+        self.assertEqual(res.data[0]['tags'][0]['name'], 'Tag1')
+
     def test_create_recipe_with_new_ingredients(self):
         """Test creating a recipe with new ingredients."""
         payload = {
@@ -324,13 +504,16 @@ class PrivateRecipeApiTests(TestCase):
 
         self.assertEqual(Recipe.objects.count(), 1)
 
-        recipe = Recipe.objects.get(id=res.data['id'])
-        self.assertEqual(recipe.ingredients.count(), 2)
-        for ingredient in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                user=self.user, name=ingredient['name']
-            ).exists()
-            self.assertTrue(exists)
+        recipe = Recipe.objects.prefetch_related('ingredients').get(
+            id=res.data['id']
+        )
+        ingredients = recipe.ingredients.all()
+        self.assertCountEqual(
+            [ingredient.name for ingredient in ingredients],
+            [ingredient['name'] for ingredient in payload['ingredients']]
+        )
+        for ingredient in ingredients:
+            self.assertEqual(ingredient.user_id, self.user.id)
 
     def test_create_recipe_with_existing_ingredients(self):
         """Test creating a recipe with existing ingredients."""
@@ -383,15 +566,12 @@ class PrivateRecipeApiTests(TestCase):
 
     def test_update_recipe_assigns_ingredients(self):
         """Test updating a recipe assigns existing ingredients."""
-        ingredient1 = Ingredient.objects.create(
-            user=self.user, name='Ingredient1'
+        ingredient1, ingredient2 = create_ingredients(
+            self.user, 'Ingredient1', 'Ingredient2'
         )
         recipe = create_recipe(user=self.user)
         recipe.ingredients.add(ingredient1)
 
-        ingredient2 = Ingredient.objects.create(
-            user=self.user, name='Ingredient2'
-        )
         payload = {'ingredients': [{'name': ingredient2.name}]}
 
         url = detail_url(recipe.id)
@@ -405,14 +585,11 @@ class PrivateRecipeApiTests(TestCase):
 
     def test_clear_recipe_ingredients(self):
         """Test clearing ingredients from a recipe."""
-        ingredient1 = Ingredient.objects.create(
-            user=self.user, name='Ingredient1'
-        )
-        ingredient2 = Ingredient.objects.create(
-            user=self.user, name='Ingredient2'
+        ingredients = create_ingredients(
+            self.user, 'Ingredient1', 'Ingredient2'
         )
         recipe = create_recipe(user=self.user)
-        recipe.ingredients.add(ingredient1, ingredient2)
+        recipe.ingredients.add(*ingredients)
 
         payload = {'ingredients': []}
         url = detail_url(recipe.id)
@@ -424,32 +601,22 @@ class PrivateRecipeApiTests(TestCase):
 
     def test_filter_by_tags(self):
         """Test filtering recipes by tags."""
-        recipe1 = create_recipe(user=self.user, title='Recipe 1')
-        recipe2 = create_recipe(user=self.user, title='Recipe 2')
-        tag1 = Tag.objects.create(user=self.user, name='Tag1')
-        tag2 = Tag.objects.create(user=self.user, name='Tag2')
+        recipe1, recipe2 = create_recipes(self.user, 'Recipe 1', 'Recipe 2')
+        tag1, tag2 = create_tags(self.user, 'Tag1', 'Tag2')
         recipe1.tags.add(tag1)
         recipe2.tags.add(tag2)
 
         res = self.client.get(RECIPES_URL, {'tags': f'{tag1.id}'})
 
-        serializer1 = RecipeSerializer(recipe1)
-        serializer2 = RecipeSerializer(recipe2)
-
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        ids = {row['id'] for row in res.data}
+        self.assertIn(recipe1.id, ids)
+        self.assertNotIn(recipe2.id, ids)
 
     def test_filter_by_ingredients(self):
         """Test filtering recipes by ingredients."""
-        recipe1 = create_recipe(user=self.user, title='Recipe 1')
-        recipe2 = create_recipe(user=self.user, title='Recipe 2')
-        ingredient1 = Ingredient.objects.create(
-            user=self.user,
-            name='Ingredient1'
-        )
-        ingredient2 = Ingredient.objects.create(
-            user=self.user,
-            name='Ingredient2'
+        recipe1, recipe2 = create_recipes(self.user, 'Recipe 1', 'Recipe 2')
+        ingredient1, ingredient2 = create_ingredients(
+            self.user, 'Ingredient1', 'Ingredient2'
         )
         recipe1.ingredients.add(ingredient1)
         recipe2.ingredients.add(ingredient2)
@@ -459,23 +626,27 @@ class PrivateRecipeApiTests(TestCase):
             {'ingredients': f'{ingredient1.id}'}
         )
 
-        serializer1 = RecipeSerializer(recipe1)
-        serializer2 = RecipeSerializer(recipe2)
-
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        ids = {row['id'] for row in res.data}
+        self.assertIn(recipe1.id, ids)
+        self.assertNotIn(recipe2.id, ids)
 
 
 class ImageUploadTests(TestCase):
     """Test image upload functionality for recipes."""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
             email='test@example.com', password='testpass123'
         )
+        cls.recipe = create_recipe(user=cls.user)
+        buffer = io.BytesIO()
+        Image.new('RGB', (100, 100)).save(buffer, format='JPEG')
+        cls.image_bytes = buffer.getvalue()
+
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(self.user)
-        self.recipe = create_recipe(user=self.user)
 
     def tearDown(self):
         return self.recipe.image.delete()
@@ -483,15 +654,10 @@ class ImageUploadTests(TestCase):
     def test_upload_image_to_recipe(self):
         """Test uploading an image to a recipe."""
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as temp_file:
-            img = Image.new('RGB', (100, 100))
-            img.save(temp_file, format='JPEG')
-            temp_file.seek(0)
-            res = self.client.post(
-                url,
-                {'image': temp_file},
-                format='multipart'
-            )
+        image = SimpleUploadedFile(
+            'image.jpg', self.image_bytes, content_type='image/jpeg'
+        )
+        res = self.client.post(url, {'image': image}, format='multipart')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
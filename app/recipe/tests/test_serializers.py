@@ -0,0 +1,92 @@
+"""
+Tests for the recipe serializers.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.models import Recipe, Tag
+from recipe.serializers import (
+    RecipeSerializer, RecipeDetailSerializer, TagSerializer
+)
+
+
+class CachedFieldsTests(SimpleTestCase):
+    """Test the per-class serializer field cache."""
+
+    def test_fields_are_copied_per_instance(self):
+        """Test each serializer instance gets its own field objects."""
+        fields1 = TagSerializer().fields
+        fields2 = TagSerializer().fields
+
+        self.assertEqual(list(fields1), ['id', 'name'])
+        self.assertIsNot(fields1['name'], fields2['name'])
+        self.assertIsInstance(fields1['name'].parent, TagSerializer)
+
+    def test_nested_fields_bound_to_own_parent(self):
+        """Test nested serializers are bound to the instance using them."""
+        serializer = RecipeSerializer()
+        tags = serializer.fields['tags']
+
+        self.assertIs(tags.parent, serializer)
+        self.assertIs(tags.child.parent, tags)
+
+
+class DictRepresentationTests(TestCase):
+    """Test serializers represent instances as plain dicts."""
+
+    def test_representation_is_plain_dict(self):
+        """Test nested items are plain dicts and None values are kept."""
+        user = get_user_model().objects.create_user('user@example.com')
+        recipe = Recipe.objects.create(
+            user=user,
+            title='Salad',
+            time_minutes=5,
+            price=Decimal('4.50'),
+        )
+        recipe.tags.add(Tag.objects.create(user=user, name='Vegan'))
+
+        data = RecipeDetailSerializer().to_representation(recipe)
+
+        self.assertIs(type(data), dict)
+        self.assertIs(type(data['tags'][0]), dict)
+        self.assertEqual(data['tags'][0]['name'], 'Vegan')
+        self.assertIsNone(data['image'])
+
+
+@override_settings(RECIPE_CACHE_TIMEOUT=60)
+class RecipeListCacheTests(TestCase):
+    """Test listed recipe representations are cached."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user('user@example.com')
+        self.recipe = Recipe.objects.create(
+            user=self.user,
+            title='Salad',
+            time_minutes=5,
+            price=Decimal('4.50'),
+        )
+        self.recipe.tags.add(Tag.objects.create(user=self.user, name='Vegan'))
+
+    def test_cached_list_skips_queries(self):
+        """Test a cached recipe is served without loading its relations."""
+        RecipeSerializer(Recipe.objects.all(), many=True).data
+        recipes = list(Recipe.objects.all())
+
+        with self.assertNumQueries(0):
+            data = RecipeSerializer(recipes, many=True).data
+
+        self.assertEqual(data[0]['tags'][0]['name'], 'Vegan')
+
+    def test_changed_recipe_is_reserialized(self):
+        """Test a changed recipe is not served from the cache."""
+        RecipeSerializer(Recipe.objects.all(), many=True).data
+        self.recipe.title = 'Green salad'
+        self.recipe.save()
+
+        data = RecipeSerializer(Recipe.objects.all(), many=True).data
+
+        self.assertEqual(data[0]['title'], 'Green salad')
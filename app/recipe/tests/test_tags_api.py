@@ -5,7 +5,7 @@ from decimal import Decimal
 
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -58,7 +58,8 @@ class PrivateTagsApiTests(TestCase):
         Tag.objects.create(user=self.user, name='Vegan')
         Tag.objects.create(user=self.user, name='Dessert')
 
-        res = self.client.get(TAGS_URL)
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL)
 
         tags = Tag.objects.all().order_by('-name')
         serializer = TagSerializer(tags, many=True)
@@ -89,6 +90,25 @@ class PrivateTagsApiTests(TestCase):
         tag.refresh_from_db()
         self.assertEqual(tag.name, payload['name'])
 
+    @override_settings(RECIPE_CACHE_TIMEOUT=60)
+    def test_update_tag_refreshes_recipes(self):
+        """Test renaming a tag is reflected in recipes listing it."""
+        tag = Tag.objects.create(user=self.user, name='Snack')
+        recipe = Recipe.objects.create(
+            title='Crisps',
+            time_minutes=1,
+            price=Decimal('1.00'),
+            user=self.user
+        )
+        recipe.tags.add(tag)
+        recipes_url = reverse('recipe:recipe-list')
+        self.client.get(recipes_url)
+
+        self.client.patch(details_url(tag.id), {'name': 'Healthy Snack'})
+        res = self.client.get(recipes_url)
+
+        self.assertEqual(res.data[0]['tags'][0]['name'], 'Healthy Snack')
+
     def test_delete_tag(self):
         """Test deleting a tag."""
         tag = Tag.objects.create(user=self.user, name='Dinner')
@@ -113,10 +133,9 @@ class PrivateTagsApiTests(TestCase):
 
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
-        serializer1 = TagSerializer(tag1)
-        serializer2 = TagSerializer(tag2)
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        ids = {row['id'] for row in res.data}
+        self.assertIn(tag1.id, ids)
+        self.assertNotIn(tag2.id, ids)
 
     def test_filtered_tags_unique(self):
         """Test that filtered tags returns unique items."""
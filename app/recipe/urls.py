@@ -1,9 +1,9 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 
 from recipe import views
 
-router = DefaultRouter()
+router = SimpleRouter()
 router.register('recipes', views.RecipeViewSet, basename='recipe')
 router.register('tags', views.TagViewSet, basename='tag')
 router.register('ingredients', views.IngredientViewSet, basename='ingredient')
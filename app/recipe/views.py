@@ -1,6 +1,12 @@
 """
 Views for the Recipe api
 """
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, Max, OuterRef
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
 from rest_framework import viewsets, mixins, status
 
 from drf_spectacular.utils import (
@@ -16,6 +22,36 @@ from core.models import Recipe, Tag, Ingredient
 from recipe import serializers
 
 
+def recipe_list_version(request, *args, **kwargs):
+    """Return a token that changes whenever any of the user's recipes do"""
+    if not hasattr(request, 'recipe_list_version'):
+        version = Recipe.objects.filter(user=request.user).aggregate(
+            count=Count('id'), updated_at=Max('updated_at')
+        )
+        request.recipe_list_version = None
+        if version['updated_at'] is not None:
+            request.recipe_list_version = (
+                f"{request.user.pk}-{version['count']}-"
+                f"{version['updated_at'].timestamp()}"
+            )
+
+    return request.recipe_list_version
+
+
+def recipe_detail_etag(request, pk=None, *args, **kwargs):
+    """Return an ETag that changes whenever the recipe does"""
+    if not str(pk).isdigit():
+        return None
+
+    updated_at = Recipe.objects.filter(
+        user=request.user, pk=pk
+    ).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None
+
+    return f'{pk}-{updated_at.timestamp()}'
+
+
 @extend_schema_view(
     list=extend_schema(
         parameters=[
@@ -58,9 +94,14 @@ class RecipeViewSet(viewsets.ModelViewSet):
         if ingredients:
             ingredient_ids = self._params_to_ints(ingredients)
             queryset = queryset.filter(ingredients__id__in=ingredient_ids)
+        if self.action == 'list':
+            # updated_at is needed for the serializer's cache key.
+            queryset = queryset.only(
+                'id', 'title', 'time_minutes', 'price', 'link', 'updated_at'
+            )
         return queryset.filter(
             user=self.request.user
-        ).distinct().order_by('-id')
+        ).prefetch_related('tags', 'ingredients').distinct().order_by('-id')
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -70,6 +111,26 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
         return self.serializer_class
 
+    @method_decorator(condition(etag_func=recipe_list_version))
+    def list(self, request, *args, **kwargs):
+        timeout = settings.RECIPE_LIST_CACHE_TIMEOUT
+        version = recipe_list_version(request)
+        if not timeout or version is None:
+            return super().list(request, *args, **kwargs)
+
+        # The version changes with any recipe change, so no invalidation.
+        key = f'recipe-list:{version}:{request.query_params.urlencode()}'
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, timeout)
+
+        return Response(data)
+
+    @method_decorator(condition(etag_func=recipe_detail_etag))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """Create a new recipe"""
         serializer.save(user=self.request.user)
@@ -106,6 +167,7 @@ class BaseRecipeAttrViewSet(mixins.DestroyModelMixin,
     """Base viewset for recipe attributes"""
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    recipe_field = None
 
     def get_queryset(self):
         """Retrieve the attributes for the authenticated user"""
@@ -114,10 +176,25 @@ class BaseRecipeAttrViewSet(mixins.DestroyModelMixin,
         )
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
+            assigned = Recipe.objects.filter(
+                **{self.recipe_field: OuterRef('pk')}
+            )
+            queryset = queryset.filter(Exists(assigned))
+        fields = self.get_serializer_class().Meta.fields
         return queryset.filter(
             user=self.request.user
-        ).order_by('-name').distinct()
+        ).only(*fields).order_by('-name')
+
+    def list(self, request, *args, **kwargs):
+        # List attributes as plain dicts, skipping model instantiation.
+        fields = self.get_serializer_class().Meta.fields
+        queryset = self.filter_queryset(self.get_queryset()).values(*fields)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(list(page))
+
+        return Response(list(queryset))
 
     def perform_create(self, serializer):
         """Create a new attribute"""
@@ -128,9 +205,11 @@ class TagViewSet(BaseRecipeAttrViewSet):
     """Manage tags in the database"""
     serializer_class = serializers.TagSerializer
     queryset = Tag.objects.all()
+    recipe_field = 'tags'
 
 
 class IngredientViewSet(BaseRecipeAttrViewSet):
     """Manage ingredients in the database"""
     serializer_class = serializers.IngredientSerializer
     queryset = Ingredient.objects.all()
+    recipe_field = 'ingredients'